@@ -1,8 +1,19 @@
 import json
 import argparse
+import codecs
+import functools
+import os
+import re
 import sys
-from typing import Dict, Any
-from urllib.parse import urlparse
+from typing import Dict, Any, Tuple
+
+# Быстрый разбор JSON через orjson, если он установлен (Этап 1)
+# orjson.JSONDecodeError наследуется от json.JSONDecodeError
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 
 # Класс для обработки ошибок конфигурации (Этап 1)
@@ -10,7 +21,63 @@ class ConfigError(Exception):
     pass
 
 
+# Обязательные поля конфигурации: имя, ожидаемый тип и его описание (Этап 1)
+_SCHEMA = (
+    ('package_name', str, 'a string'),
+    ('repo_url', str, 'a string'),
+    ('test_repo_mode', bool, 'a boolean'),
+    ('output_image', str, 'a string'),
+    ('ascii_tree', bool, 'a boolean'),
+)
+
+
+# Размер порции чтения, когда размер файла заранее неизвестен (Этап 1)
+_READ_CHUNK = 65536
+
+
+# Маркер отсутствующего поля в конфигурации (Этап 1)
+_MISSING = object()
+
+
+# Шаблон URL конкретного пакета на crates.io: схема и хост без учёта регистра,
+# допускаются поддомены, данные пользователя и порт (Этап 1)
+_CRATES_RE = re.compile(
+    r'^(?i:https?)://(?:[^/?#@]*@)?(?i:(?:[^/?#@:]*\.)?crates\.io)(?::\d+)?/crates/[^/?#]+')
+
+# Схема и сетевая часть URL для уточнения причины отказа (Этап 1)
+_URL_PREFIX_RE = re.compile(r'^([A-Za-z][A-Za-z0-9+.-]*)://([^/?#]*)')
+
+
+# Проверка URL по шаблону с кэшированием результата для повторных конфигураций (Этап 1)
+@functools.lru_cache(maxsize=128)
+def _check_registry_url(url: str) -> Tuple[bool, str]:
+    # Пробелы по краям URL не учитываются (Этап 1)
+    url = url.strip()
+    if _CRATES_RE.match(url):
+        return True, ""
+
+    # Уточняем причину отказа дешёвыми проверками схемы и хоста (Этап 1)
+    prefix = _URL_PREFIX_RE.match(url)
+    if prefix is None or not prefix.group(2):
+        return False, "repo_url must be a valid URL"
+    if prefix.group(1).lower() not in ('http', 'https'):
+        return False, "repo_url must use the http or https scheme"
+    hostname = prefix.group(2).rpartition('@')[2].partition(':')[0].lower()
+    if hostname != "crates.io" and not hostname.endswith(".crates.io"):
+        return False, "repo_url must point to crates.io"
+    return False, "repo_url must point to a specific crate (format: https://crates.io/crates/package_name)"
+
+
+# Проверка URL пакета на crates.io по заранее скомпилированному шаблону (Этап 1)
+def _validate_registry_url(url: str) -> None:
+    ok, reason = _check_registry_url(url)
+    if not ok:
+        raise ConfigError(f"Invalid repo_url: {reason}")
+
+
 class DependencyVisualizer:
+    __slots__ = ('config',)
+
     def __init__(self, config_path: str):
         self.config = self._load_config(config_path)
         self._validate_config()
@@ -18,8 +85,25 @@ class DependencyVisualizer:
     # Загрузка конфигурации из JSON файла (Этап 1)
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            # Чтение файла через os.read до пустого ответа (EOF): обычный файл читается
+            # за два вызова, каналы и /dev/stdin дочитываются порциями (Этап 1)
+            fd = os.open(config_path, os.O_RDONLY)
+            try:
+                chunk_size = os.fstat(fd).st_size or _READ_CHUNK
+                chunks = []
+                while True:
+                    chunk = os.read(fd, chunk_size)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    chunk_size = _READ_CHUNK
+            except OSError as e:
+                # os.read не указывает путь в ошибке, добавляем его сами (Этап 1)
+                raise OSError(e.errno, e.strerror, config_path) from e
+            finally:
+                os.close(fd)
+            # BOM отбрасывается, чтобы json и orjson разбирали файл одинаково (Этап 1)
+            return _loads(b"".join(chunks).removeprefix(codecs.BOM_UTF8))
         except FileNotFoundError:
             raise ConfigError(f"Config file not found: {config_path}")
         except json.JSONDecodeError as e:
@@ -27,69 +111,40 @@ class DependencyVisualizer:
 
     # Валидация всех параметров конфигурации (Этап 1)
     def _validate_config(self):
-        required_fields = [
-            'package_name',
-            'repo_url',
-            'test_repo_mode',
-            'output_image',
-            'ascii_tree'
-        ]
-
-        # Проверка наличия всех обязательных полей (Этап 1)
-        for field in required_fields:
-            if field not in self.config:
-                raise ConfigError(f"Missing required field: {field}")
-
-        # Проверка типов данных для каждого параметра (Этап 1)
-        if not isinstance(self.config['package_name'], str):
-            raise ConfigError("package_name must be a string")
-
-        if not isinstance(self.config['repo_url'], str):
-            raise ConfigError("repo_url must be a string")
+        cfg = self.config
+        if not isinstance(cfg, dict):
+            raise ConfigError("Config file must contain a JSON object")
+
+        # Проверка наличия и типа каждого обязательного поля за один проход (Этап 1)
+        for name, typ, type_desc in _SCHEMA:
+            value = cfg.get(name, _MISSING)
+            if value is _MISSING:
+                raise ConfigError(f"Missing required field: {name}")
+            if type(value) is not typ and not isinstance(value, typ):
+                raise ConfigError(f"{name} must be {type_desc}")
 
         # Валидация URL формата для crates.io (Этап 1)
-        try:
-            result = urlparse(self.config['repo_url'])
-            if not all([result.scheme, result.netloc]):
-                raise ConfigError("repo_url must be a valid URL")
-
-            # Проверка, что URL соответствует формату crates.io (Этап 1)
-            if "crates.io" not in result.netloc:
-                raise ConfigError("repo_url must point to crates.io")
-
-            if "/crates/" not in result.path:
-                raise ConfigError(
-                    "repo_url must point to a specific crate (format: https://crates.io/crates/package_name)")
-
-        except Exception as e:
-            raise ConfigError(f"Invalid repo_url: {e}")
-
-        if not isinstance(self.config['test_repo_mode'], bool):
-            raise ConfigError("test_repo_mode must be a boolean")
-
-        if not isinstance(self.config['output_image'], str):
-            raise ConfigError("output_image must be a string")
-
-        if not isinstance(self.config['ascii_tree'], bool):
-            raise ConfigError("ascii_tree must be a boolean")
+        _validate_registry_url(cfg['repo_url'])
 
     # Вывод всех параметров конфигурации в формате ключ-значение (Этап 1)
     def print_config(self):
-        print("Configuration parameters:")
-        for key, value in self.config.items():
-            print(f"  {key}: {value}")
+        # Формируем весь вывод и пишем его одним вызовом (Этап 1)
+        lines = [f"  {key}: {value}" for key, value in self.config.items()]
+        sys.stdout.write("Configuration parameters:\n" + "\n".join(lines) + "\n")
 
     # Демонстрационная функция для crates.io (Этап 1)
     def demonstrate_crates_io_usage(self):
         """Демонстрация работы с конкретным пакетом на crates.io"""
-        print(f"\nDemo: Will analyze package '{self.config['package_name']}'")
-        print(f"Package URL: {self.config['repo_url']}")
+        cfg = self.config
+        print(f"\nDemo: Will analyze package '{cfg['package_name']}'")
+        print(f"Package URL: {cfg['repo_url']}")
 
         # Извлекаем имя пакета из URL для демонстрации (Этап 1)
-        package_from_url = self.config['repo_url'].split('/')[-1]
+        url = cfg['repo_url'].partition('?')[0].partition('#')[0]
+        package_from_url = url.rpartition('/')[2]
         print(f"Package name extracted from URL: {package_from_url}")
 
-        if self.config['test_repo_mode']:
+        if cfg['test_repo_mode']:
             print("Using test repository mode")
         else:
             print("Using live crates.io registry")
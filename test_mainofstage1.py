@@ -0,0 +1,21 @@
+import unittest
+
+from mainofstage1 import ConfigError, _validate_registry_url
+
+
+# Регрессионные проверки валидации repo_url (Этап 1)
+class ValidateRegistryUrlTest(unittest.TestCase):
+    def test_accepts_crate_url(self):
+        _validate_registry_url("https://crates.io/crates/serde")
+
+    def test_rejects_foreign_host_with_query_before_path(self):
+        with self.assertRaisesRegex(ConfigError, "must point to crates.io"):
+            _validate_registry_url("https://evil.com?crates.io/crates/serde")
+
+    def test_rejects_foreign_host_with_fragment_before_path(self):
+        with self.assertRaisesRegex(ConfigError, "must point to crates.io"):
+            _validate_registry_url("https://evil.com#crates.io/crates/serde")
+
+
+if __name__ == '__main__':
+    unittest.main()